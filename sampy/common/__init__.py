@@ -15,7 +15,6 @@ by Samuel Thorpe
 import sys
 from collections import namedtuple
 import functools
-import operator
 import code
 import inspect
 import time
@@ -23,6 +22,12 @@ import numbers
 import numpy as np
 
 
+# # Globals
+# -----------------------------------------------------|
+EPS_FLOAT32 = np.finfo(np.float32).eps
+KEYBOARD_PHRASE = 'keyboard(locals(), globals())'
+
+
 # # General Exception Class
 # -----------------------------------------------------|
 CommonException = type('CommonException', (Exception,), {})
@@ -34,16 +39,17 @@ def keyboard(loc, glob):
     """Mimics Matlab's keyboard, but with locals, globals as inputs."""
     tag = '\n\n>>> (InteractiveConsole) : {} : line {} : {} >>>'.\
         format(*check_stack_phrase(inspect.stack()))
-    code.interact(banner=tag, local={**loc, **glob})
+    # NOTE: code.interact execs with this mapping as globals, which must be
+    #       a real dict (a lazy ChainMap is rejected), so copy once with
+    #       locals taking precedence over globals as in normal name lookup
+    code.interact(banner=tag, local={**glob, **loc})
 
 
-def check_stack_phrase(stack, phrase='keyboard(locals(), globals())'):
+def check_stack_phrase(stack, phrase=KEYBOARD_PHRASE):
     """Check stack for keyboard phrase."""
-    for elmnt in stack:
-        for line in elmnt[-2]:
-            if phrase in line:
-                return elmnt[1:4]
-    return ('STACK', 'NOT', 'PARSED')
+    return next((elmnt[1:4] for elmnt in stack
+                 for line in (elmnt[-2] or ()) if phrase in line),
+                ('STACK', 'NOT', 'PARSED'))
 
 
 def struct(dat, loc=None):
@@ -72,16 +78,25 @@ def struct(dat, loc=None):
         return obj.get(attr) if isinstance(obj, dict) else getattr(obj, attr)
 
     if isinstance(dat, list):  # specified list of variable names
-        structure = namedtuple('canonical_tuple', dat)
+        structure = _canonical_tuple(tuple(dat))
         named_tup = structure(*[_get(loc, q) for q in dat])
     else:
-        loc = dat.keys() if isinstance(dat, dict) else \
-            [x for x in dir(dat) if x not in dir(type(dat))]
-        structure = namedtuple('canonical_tuple', loc)
+        if isinstance(dat, dict):
+            loc = tuple(dat.keys())
+        else:  # instance attributes (dir output is sorted)
+            type_attrs = frozenset(dir(type(dat)))
+            loc = tuple(x for x in dir(dat) if x not in type_attrs)
+        structure = _canonical_tuple(loc)
         named_tup = structure(*[_get(dat, q) for q in loc])
     return named_tup
 
 
+@functools.lru_cache(maxsize=None)
+def _canonical_tuple(fields):
+    """Return (cached) canonical namedtuple class for tuple of field names."""
+    return namedtuple('canonical_tuple', fields)
+
+
 def struct_replace(strct, fields, val):
     """Replace (possibly nested) canonical tuple fields with new value.
 
@@ -95,25 +110,49 @@ def struct_replace(strct, fields, val):
         TYPE: Description
     """
     fields = [fields] if isinstance(fields, str) else fields
-    dct = recursive_dict(strct)
-    set_in_dict(dct, fields, val)
-    return recursive_struct(dct)
+    return _replace_path(strct, fields, val)
+
+
+def _replace_path(strct, fields, val):
+    """Rebuild only the canonical tuples along the path to the edited field.
+
+    NOTE: as with set_in_dict, the leaf field may be new (it is appended to
+          the last canonical tuple), but intermediate fields must exist.
+    """
+    if len(fields) == 1:
+        if fields[0] not in strct._fields:
+            structure = _canonical_tuple(strct._fields + (fields[0],))
+            return structure(*strct, val)
+        return strct._replace(**{fields[0]: val})
+    child = _replace_path(getattr(strct, fields[0]), fields[1:], val)
+    return strct._replace(**{fields[0]: child})
 
 
 def recursive_dict(strct):
-    """Recursively walk a structure to convert to nested dict."""
-    dct = strct._asdict()
-    for key, val in dct.items():
-        if hasattr(val, '_fields') and hasattr(val, '_asdict'):
-            dct[key] = recursive_dict(val)
-    return dct
+    """Walk a structure (iteratively) to convert to nested dict."""
+    root = strct._asdict()
+    stack = [root]
+    while stack:
+        dct = stack.pop()
+        for key, val in dct.items():
+            if hasattr(val, '_fields') and hasattr(val, '_asdict'):
+                dct[key] = val._asdict()
+                stack.append(dct[key])
+    return root
 
 
 def recursive_struct(dct):
-    """Recursively walk a nested dict and replace with struct."""
-    for key, val in dct.items():
-        if isinstance(val, dict):
-            dct[key] = recursive_struct(val)
+    """Walk a nested dict (iteratively) and replace with struct."""
+    # collect nested dicts parents-first, then convert children-first
+    ordered, stack = [], [dct]
+    while stack:
+        node = stack.pop()
+        ordered.append(node)
+        stack.extend(val for val in node.values() if isinstance(val, dict))
+    for node in reversed(ordered):
+        for key, val in node.items():
+            if isinstance(val, dict):
+                node[key] = struct(val)
     return struct(dct)
 
 
@@ -123,7 +162,9 @@ def get_from_dict(dct, map_list):
     https://stackoverflow.com/questions/14692690/ ...
         access-nested-dictionary-items-via-a-list-of-keys
     """
-    return functools.reduce(operator.getitem, map_list, dct)
+    for key in map_list:
+        dct = dct[key]
+    return dct
 
 
 def set_in_dict(dct, map_list, val):
@@ -132,7 +173,9 @@ def set_in_dict(dct, map_list, val):
     https://stackoverflow.com/questions/14692690/ ...
         access-nested-dictionary-items-via-a-list-of-keys
     """
-    get_from_dict(dct, map_list[:-1])[map_list[-1]] = val
+    for key in map_list[:-1]:
+        dct = dct[key]
+    dct[map_list[-1]] = val
 
 
 def info(obj, spacing=10):
@@ -160,7 +203,7 @@ def info(obj, spacing=10):
 
 # # Check Approximate Equality
 # -----------------------------------------------------|
-def check_equality(x, y, tol=np.finfo(np.float32).eps):
+def check_equality(x, y, tol=EPS_FLOAT32):
     """Check approximate equality for general data types.
 
     NOTE: this will only work with iterables (i.e. which have a
@@ -169,24 +212,74 @@ def check_equality(x, y, tol=np.finfo(np.float32).eps):
     """
     # # check objects are of comparable type
     if isinstance(x, numbers.Number):
-        assert isinstance(x, numbers.Number)
+        assert isinstance(y, numbers.Number), _cmp_str(x, y)
     else:
-        assert type(x) is type(y), \
-            "MISMATCH: ({type(x)}) {x} != ({type(y)}) {y}"
+        assert type(x) is type(y), _cmp_str(x, y)
+
+    # # compare numeric arrays/sequences in one vectorized pass
+    x_arr, y_arr = _as_numeric_array(x), _as_numeric_array(y)
+    if x_arr is not None and y_arr is not None:
+        assert x_arr.shape == y_arr.shape
+        assert _arrays_close(x_arr, y_arr, tol), _cmp_str(x, y)
+        return
 
     # # check exact/approximate equality as appropriate
-    if isinstance(x, float) and np.isnan(x):
-        assert np.isnan(y)
-    if isinstance(x, float) and np.isinf(x):
-        assert x == y
-    elif isinstance(x, numbers.Number):
-        assert np.abs(x - y) < tol
+    if isinstance(x, numbers.Number):
+        assert _scalar_close(x, y, tol), _cmp_str(x, y)
     elif isinstance(x, (str, bool)):
         assert x == y
     elif hasattr(x, '__iter__'):
         assert hasattr(y, '__iter__') and len(x) == len(y)
         for x_itr, y_itr in zip(x, y):
-            check_equality(x_itr, y_itr)
+            check_equality(x_itr, y_itr, tol=tol)
+
+
+def _scalar_close(x, y, tol):
+    """Return True if scalars are equal, both NaN, or within tol.
+
+    NOTE: exact equality is checked first so matching infs never reach the
+          subtraction (inf - inf would be NaN). Only floats can be NaN, so
+          np.isnan is never called on e.g. Decimal or Fraction.
+    """
+    return bool(x == y or abs(x - y) < tol or
+                (_is_float(x) and _is_float(y) and
+                 np.isnan(x) and np.isnan(y)))
+
+
+def _arrays_close(x_arr, y_arr, tol):
+    """Return True if _scalar_close holds for every element pair.
+
+    NOTE: np.allclose is not used as it accepts |x - y| <= tol, while the
+          scalar check is strict. Inputs are promoted like np.allclose does
+          (to at least float), so bool/unsigned subtraction is safe.
+    """
+    dtype = np.result_type(x_arr, y_arr, 1.)
+    x_arr = x_arr.astype(dtype, copy=False)
+    y_arr = y_arr.astype(dtype, copy=False)
+    with np.errstate(invalid='ignore'):  # inf - inf, checked by == first
+        close = (x_arr == y_arr) | (np.abs(x_arr - y_arr) < tol)
+    return bool(np.all(close | (np.isnan(x_arr) & np.isnan(y_arr))))
+
+
+def _is_float(x):
+    """Return True for python and numpy floats."""
+    return isinstance(x, (float, np.floating))
+
+
+def _as_numeric_array(x):
+    """Return x as a numeric ndarray, or None if it must be compared per item.
+
+    NOTE: the dtype is checked after conversion, so sequences of Decimal,
+          Fraction or out-of-range ints (which become object arrays) are
+          left to the recursive element-wise comparison.
+    """
+    if isinstance(x, (list, tuple)):
+        if not x or not all(isinstance(v, numbers.Number) for v in x):
+            return None
+        x = np.asarray(x)
+    if isinstance(x, np.ndarray) and x.dtype.kind in 'biufc':
+        return x
+    return None
 
 
 def _cmp_str(x, y):
@@ -197,13 +290,75 @@ def _cmp_str(x, y):
 # # Common Time Series Manipulation
 # -----------------------------------------------------|
 def refine_series(coarse_ts, refined_ts):
-    """Refine a coarse time series to finer resolution."""
-    ridx = np.zeros(refined_ts.shape[0]).astype(int)
-    for idx, tim in enumerate(refined_ts):
-        leading_samps = np.where(coarse_ts <= tim)[0]
-        if leading_samps.shape[0]:
-            ridx[idx] = leading_samps[-1]
-    return ridx
+    """Refine a coarse time series to finer resolution.
+
+    For each refined timestamp return the index of the last coarse sample
+    at or before it (0 if there is none). coarse_ts must be sorted.
+
+    NOTE: when numba is available (pip install sampy[numba]) a jitted hunt
+          search is used, which is much faster than plain bisection for
+          sorted refined_ts, o.w. this falls back to np.searchsorted.
+    """
+    hunt = _jitted_hunt()
+    if hunt is None:
+        ridx = np.searchsorted(coarse_ts, refined_ts, side='right') - 1
+        np.clip(ridx, 0, None, out=ridx)
+        return ridx.astype(np.intp, copy=False)
+
+    refined_ts = np.asarray(refined_ts)
+    out = np.empty(refined_ts.shape[0], dtype=np.intp)
+    return hunt(np.asarray(coarse_ts), refined_ts, out)
+
+
+@functools.lru_cache(maxsize=None)
+def _jitted_hunt():
+    """Return the numba-jitted _refine_hunted (None if numba is missing)."""
+    try:
+        import numba
+    except ImportError:  # pragma: no cover
+        return None
+    return numba.njit(cache=True)(_refine_hunted)
+
+
+def _refine_hunted(coarse, refined, out):
+    """Hunt for refined indices, reusing the previous result as a guess.
+
+    See Numerical Recipes "hunt": expand a bracket exponentially from the
+    last found index, then bisect within it. coarse[-1] and coarse[n] are
+    treated as -inf and +inf respectively.
+    """
+    n_coarse = coarse.shape[0]
+    guess = -1
+    for idx in range(refined.shape[0]):
+        tim = refined[idx]
+        step = 1
+        lo = guess
+        if lo >= 0 and coarse[lo] > tim:  # hunt down
+            hi = lo
+            lo = hi - step
+            while lo >= 0 and coarse[lo] > tim:
+                hi = lo
+                step *= 2
+                lo = hi - step
+            lo = max(lo, -1)
+        else:  # hunt up
+            hi = lo + step
+            while hi < n_coarse and coarse[hi] <= tim:
+                lo = hi
+                step *= 2
+                hi = lo + step
+            hi = min(hi, n_coarse)
+
+        # bisect the bracket: coarse[lo] <= tim < coarse[hi]
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if coarse[mid] <= tim:
+                lo = mid
+            else:
+                hi = mid
+        guess = lo
+        out[idx] = max(lo, 0)
+    return out
 
 
 # # Timers
@@ -217,6 +372,12 @@ class LoopStatusTimer():
         self.n_cols = n_cols
         self.msg = msg
 
+        # precompute invariant bar pieces, redraw at most once per column
+        self._bar_full = ':'*n_cols
+        self._bar_empty = ' '*n_cols
+        self._suffix = ('\033[0m{}/' + str(n_loops)).format
+        self._redraw_every = max(1, n_loops // n_cols)
+
     def setup(self):
         """Set up the status bar."""
         print('{}0/{}'.format(' '*self.n_cols, self.n_loops), end='\r')
@@ -224,17 +385,17 @@ class LoopStatusTimer():
 
     def update(self, loop):
         """Update the status bar."""
-        updated = self._update_string(loop+1)
-        print(updated, end='\r')
+        loop += 1
+        if loop % self._redraw_every and loop != self.n_loops:
+            return
+        print(self._update_string(loop), end='\r')
         sys.stdout.flush()
 
     def _update_string(self, loop):
         """Return the updated string."""
-        n_char = int(float(loop)*float(self.n_cols)/float(self.n_loops))
-        updated = \
-            '\033[92m' + ':'*n_char + ' '*(self.n_cols-n_char) + \
-            '\033[0m' + '{}/{}'.format(loop, self.n_loops)
-        return updated
+        n_char = loop*self.n_cols // self.n_loops
+        return '\033[92m' + self._bar_full[:n_char] + \
+            self._bar_empty[n_char:] + self._suffix(loop)
 
     def run(self, method, *args, **kwrgs):
         """Wrap a function call in some standard way."""
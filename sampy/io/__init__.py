@@ -12,24 +12,44 @@ by Samuel Thorpe
 
 # # Imports
 # -----------------------------------------------------|
-from os.path import splitext
+from os import remove, fspath
+from os.path import splitext, exists, getsize
+import re
 import dill
+import pickle
 import json
 import pandas as pd
 import numpy as np
 from sampy import SampyException
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+# # Globals
+# -----------------------------------------------------|
+PICKLE_BUFFER_EXT = '.bufs'
+LONG_DIGITS = re.compile(rb'\d{19}')  # may fall outside [-2**63, 2**64)
 
 
 # # Common Loading/Munging/Saving/Path-Manipulation
 # -----------------------------------------------------|
 def batch_saver(dat, fout, **kargs):
-    """General wrapper for saving data."""
+    """General wrapper for saving data.
+
+    NOTE: .pkl files may be written with a companion <fout>.bufs file
+          holding out-of-band array buffers; keep (copy/move) the two
+          together, as the .pkl cannot be loaded without it.
+    NOTE: .json is always written with the stdlib json module (indent=4,
+          NaN/Infinity allowed), so the output does not depend on whether
+          orjson is installed; orjson is only used to speed up loading.
+    """
     ext = splitext(fout)[-1]
     if ext == '.csv':
         dat.to_csv(fout, **kargs)
     elif ext == '.pkl':
-        with open(fout, 'wb') as pkl:
-            dill.dump(dat, pkl, **kargs)
+        _pickle_saver(dat, fout, **kargs)
     elif ext == '.txt':
         with open(fout, 'w') as txt:
             for lin in dat:
@@ -38,27 +58,133 @@ def batch_saver(dat, fout, **kargs):
         with open(fout, 'w') as jsn:
             json.dump(dat, jsn, indent=4, **kargs)
     elif ext == '.npy':
+        kargs.setdefault('allow_pickle', False)
         np.save(fout, dat, **kargs)
     else:
         raise CommonIOException('Unrecognized Batch Extention')
 
 
-def batch_loader(fin):
-    """General wrapper for loading data."""
+def batch_loader(fin, mmap_mode=None):
+    """General wrapper for loading data.
+
+    Args:
+        fin (str): path to file
+        mmap_mode (str, optional): np.load memory-map mode for .npy files,
+            None (default) reads the full array into memory, 'r' gives a
+            read-only view and 'r+' a writable view (changes persist to
+            disk). NOTE: do not save over a file that is still mapped.
+
+    Returns:
+        loaded data
+    """
     ext = splitext(fin)[-1]
     if ext == '.csv':
         return pd.read_csv(fin)
     if ext == '.pkl':
-        with open(fin, 'rb') as pkl:
-            return dill.load(pkl)
+        return _pickle_loader(fin)
+    if ext == '.npy':
+        return np.load(fin, mmap_mode=mmap_mode, allow_pickle=False)
     if ext == '.json':
-        with open(fin, 'rb') as jsn:
-            return json.load(jsn)
+        return _json_loader(fin)
     # # else treat as text file
     with open(fin, 'rb') as txt:
         return txt.readlines()
 
 
+# # Json Helpers
+# -----------------------------------------------------|
+def _json_loader(fin):
+    """Load json, parsing with orjson when it is installed.
+
+    NOTE: orjson rejects some files the stdlib accepts (e.g. NaN/Infinity),
+          which are re-parsed with json, and reads ints outside its
+          [-2**63, 2**64) range as lossy floats, so files with any 19+ digit
+          run (e.g. -2**63 - 1) skip orjson. Results thus do not depend on
+          whether orjson is available.
+    """
+    with open(fin, 'rb') as jsn:
+        raw = jsn.read()
+    if orjson is not None and not LONG_DIGITS.search(raw):
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw)
+
+
+# # Pickle Helpers
+# -----------------------------------------------------|
+def _pickle_saver(dat, fout, **kargs):
+    """Save with pickle protocol 5, falling back to dill.
+
+    Contiguous buffers (e.g. numpy arrays) are written out-of-band to a
+    companion <fout>.bufs file as length-prefixed raw bytes, avoiding an
+    extra copy into the pickle stream. Objects plain pickle cannot handle
+    (lambdas, closures, etc.) or calls with dill kwargs are saved with dill.
+    """
+    buffers = []
+    stream = None if kargs else _plain_pickle(dat, buffers)
+    with open(fout, 'wb') as pkl:
+        if stream is None:
+            dill.dump(dat, pkl, **kargs)
+        else:
+            pkl.write(stream)
+
+    # write (or clear stale) out-of-band buffers
+    buf_file = fspath(fout) + PICKLE_BUFFER_EXT
+    if buffers:
+        with open(buf_file, 'wb') as bufs:
+            for buf in buffers:
+                raw = buf.raw()
+                bufs.write(raw.nbytes.to_bytes(8, 'little'))
+                bufs.write(raw)
+    elif exists(buf_file):
+        remove(buf_file)
+
+
+def _plain_pickle(dat, buffers):
+    """Return protocol 5 pickle bytes of dat, or None if dill is needed.
+
+    NOTE: plain pickle stores classes/functions by reference, so anything
+          referencing __main__ would not load from other scripts; those
+          (and any stream merely containing the string) are left to dill,
+          which stores them by value.
+    """
+    try:
+        stream = pickle.dumps(dat, protocol=5, buffer_callback=buffers.append)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        stream = None
+    if stream is None or b'__main__' in stream:
+        buffers.clear()
+        return None
+    return stream
+
+
+def _pickle_loader(fin):
+    """Load pickle/dill file, with out-of-band buffers if present.
+
+    NOTE: only the plain pickle path writes buffers, so files with a .bufs
+          companion load with the C unpickler; others may hold dill's
+          by-value objects, which need dill's unpickler.
+    """
+    buf_file = fspath(fin) + PICKLE_BUFFER_EXT
+    if not exists(buf_file):
+        with open(fin, 'rb') as pkl:
+            return dill.load(pkl)
+
+    buffers = []
+    data = memoryview(bytearray(getsize(buf_file)))
+    with open(buf_file, 'rb') as bufs:
+        bufs.readinto(data)
+    pos = 0
+    while pos < len(data):
+        size = int.from_bytes(data[pos:pos + 8], 'little')
+        buffers.append(data[pos + 8:pos + 8 + size])
+        pos += 8 + size
+    with open(fin, 'rb') as pkl:
+        return pickle.load(pkl, buffers=buffers)
+
+
 # # General Exception Class
 # -----------------------------------------------------|
 CommonIOException = type('CommonIOException', (SampyException,), {})
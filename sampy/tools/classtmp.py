@@ -35,57 +35,52 @@ from datetime import datetime
 import re
 
 
+# # Templates
+# -----------------------------------------------------|
+_BNK = "# " + "-" * 76 + "|\n\n\n"
+_SMBNK = "# " + "-" * 53 + "|\n"
+_DATE_FMT = "%B %d, %Y"
+_CLASS_TEMPLATE = '''"""
+Insert description.
+
+# NOTES
+{bnk}Written {date}
+By Samuel Thorpe
+"""
+
+
+# # Imports
+{smbnk}import os
+import numpy as np
+
+
+# # Main Class
+{smbnk}class {class_name}:
+    """ class object description
+    """
+    # __slots__ = ()  # to drop the __dict__, uncomment and list all attrs
+
+    def __init__(self):
+        """Initialize class."""
+        from sampy.common import keyboard
+        keyboard(locals(), globals())
+
+
+# # Main Entry
+{smbnk}if __name__ == "__main__":
+    CLS = {class_name}()
+'''
+
+
 # # Defs
 # -----------------------------------------------------|
 def build_template(fn):
     """Build the class template."""
     cn = re.sub('.py', '', fn).split('_')
     cn = ''.join([c.capitalize() for c in cn if c])
-    lines = []
-    lines.append('"""\n')
-    lines.append('Insert description.\n\n')
-
-    # # Default Commenting style
-    # -----------------------------------------------------|
-    hdl = ['# NOTES\n']
-    bnk = "{}{}{}\n\n\n".format("# ", "-" * 76, "|")
-    smbnk = "{}{}{}\n".format("# ", "-" * 53, "|")
-    for h in hdl:
-        lines.append(h)
-        lines.append(bnk)
-    now = datetime.now()
-    lines.append('Written %s\n' % now.strftime("%B %d, %Y"))
-    lines.append('By Samuel Thorpe\n')
-    lines.append('"""\n\n\n')
-
-    # # Default Imports
-    # -----------------------------------------------------|
-    lines.append('# # Imports\n')
-    lines.append(smbnk)
-    default_imports = ['os', 'numpy as np']
-    for mod in default_imports:
-        lines.append('import {}\n'.format(mod))
-    lines.append('\n\n')
-
-    # # Default Class Structure
-    # -----------------------------------------------------|
-    lines.append('# # Main Class\n')
-    lines.append('%s' % smbnk)
-    lines.append('class {}:\n'.format(cn))
-    lines.append('    """ class object description\n')
-    lines.append('    """\n')
-    lines.append('    def __init__(self):\n')
-    lines.append('        """Initialize class."""\n')
-    lines.append('        from sampy.common import keyboard\n')
-    lines.append('        keyboard(locals(), globals())\n\n\n')
-
-    # # Default Main Entry
-    # -----------------------------------------------------|
-    lines.append('# # Main Entry\n')
-    lines.append(smbnk)
-    lines.append('if __name__ == "__main__":\n')
-    lines.append('    CLS = {}()\n'.format(cn))
-    return lines
+    return [_CLASS_TEMPLATE.format(
+        bnk=_BNK, smbnk=_SMBNK, date=datetime.now().strftime(_DATE_FMT),
+        class_name=cn)]
 
 
 def write_template(lines, args):
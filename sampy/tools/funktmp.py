@@ -34,53 +34,46 @@ from subprocess import call
 from datetime import datetime
 
 
+# # Templates
+# -----------------------------------------------------|
+_BNK = "# " + "-" * 76 + "|\n\n\n"
+_SMBNK = "# " + "-" * 53 + "|\n"
+_DATE_FMT = "%B %d, %Y"
+_FUNC_TEMPLATE = '''"""
+Insert description.
+
+# NOTES
+{bnk}Written {date}
+By Samuel Thorpe
+"""
+
+
+# # Imports
+{smbnk}import os
+import numpy as np
+import matplotlib.pyplot as plt
+
+
+# # Defs
+{smbnk}def main():
+    """Run main method."""
+    from sampy.common import keyboard
+    keyboard(locals(), globals())
+
+
+# # Main Entry
+{smbnk}if __name__ == "__main__":
+    main()
+'''
+
+
 # # Defs
 # -----------------------------------------------------|
 def build_template(fn):
     #  pylint: disable=invalid-name
-    """Build the class template."""
-    lines = []
-    lines.append('"""\n')
-    lines.append('Insert description.\n\n')
-
-    # # Default Commenting style
-    # -----------------------------------------------------|
-    hdl = ['# NOTES\n']
-    bnk = "{}{}{}\n\n\n".format("# ", "-" * 76, "|")
-    smbnk = "{}{}{}\n".format("# ", "-" * 53, "|")
-    for n in range(1):
-        lines.append(hdl[n - 1])
-        lines.append(bnk)
-    now = datetime.now()
-    lines.append('Written {}\n'.format(now.strftime("%B %d, %Y")))
-    lines.append('By Samuel Thorpe\n')
-    lines.append('"""\n\n\n')
-
-    # # Default Imports
-    # -----------------------------------------------------|
-    lines.append('# # Imports\n')
-    lines.append(smbnk)
-    default_imports = ['os', 'numpy as np', 'matplotlib.pyplot as plt']
-    for mod in default_imports:
-        lines.append('import {}\n'.format(mod))
-    lines.append('\n\n')
-
-    # # Default Function Def
-    # -----------------------------------------------------|
-    lines.append('# # Defs\n')
-    lines.append(smbnk)
-    lines.append('def main():\n')
-    lines.append('    """Run main method."""\n')
-    lines.append('    from sampy.common import keyboard\n')
-    lines.append('    keyboard(locals(), globals())\n\n\n')
-
-    # # Default Main Entry
-    # -----------------------------------------------------|
-    lines.append('# # Main Entry\n')
-    lines.append(smbnk)
-    lines.append('if __name__ == "__main__":\n')
-    lines.append('    main()\n')
-    return lines
+    """Build the function template."""
+    return [_FUNC_TEMPLATE.format(
+        bnk=_BNK, smbnk=_SMBNK, date=datetime.now().strftime(_DATE_FMT))]
 
 
 def write_template(lines, args):
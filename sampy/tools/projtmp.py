@@ -16,12 +16,16 @@ By Samuel Thorpe
 import os
 from os.path import basename, join
 import argparse
+import mmap
 from pathlib import Path
 import shutil
 import subprocess
-import json
 import requests
 from git import Repo
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
 
 
 # # Globals
@@ -29,6 +33,11 @@ from git import Repo
 DEFAULT_PROJECT_DIR = join(Path.home(), 'Projects')
 DEFAULT_LOCAL_TEMPLATE = join(Path.home(), 'Repos', 'st-experiment-template')
 REMOTE_URL = 'git@github.com:samuelgthorpe'
+FICLONE = 0x40049409  # linux ioctl for copy-on-write file clones
+MMAP_THRESHOLD = 65536  # bytes, scan larger files via mmap before reading
+TEMPLATE_IGNORE = shutil.ignore_patterns(
+    '.git', '__pycache__', '.venv', '*.pyc')
+SESSION = requests.Session()  # reuse pooled connections to the github api
 
 
 # # Defs
@@ -60,19 +69,38 @@ def init_project_dir(proj_dir, repo_dir, args):
     os.makedirs(proj_dir)
     if args.sync:
         _pull_template(proj_dir, repo_dir, args.project_name)
+
+        # delete template .git directory
+        template_git_dir = join(repo_dir, '.git')
+        shutil.rmtree(template_git_dir)
     else:
-        shutil.copytree(DEFAULT_LOCAL_TEMPLATE, repo_dir)
+        # NOTE: .git, caches and venvs are never copied so need no cleanup
+        shutil.copytree(DEFAULT_LOCAL_TEMPLATE, repo_dir,
+                        copy_function=_reflink_copy, ignore=TEMPLATE_IGNORE)
+
 
-    # delete template .git directory
-    template_git_dir = join(repo_dir, '.git')
-    shutil.rmtree(template_git_dir)
+def _reflink_copy(src, dst):
+    """Clone file copy-on-write where supported (btrfs, xfs), o.w. copy.
+
+    Only permission bits are preserved (e.g. executable scripts), timestamps
+    and other metadata are skipped as the files are rewritten right after.
+    """
+    if fcntl is not None:
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            shutil.copymode(src, dst)
+            return dst
+        except OSError:
+            pass
+    return shutil.copy(src, dst)
 
 
 def _pull_template(proj_dir, repo_dir, proj_name):
-    """Pull template from github."""
-    os.makedirs(repo_dir)
+    """Pull template from github (shallow, history is discarded anyway)."""
     template_url = f'{REMOTE_URL}/st-experiment-template.git'
-    Repo.clone_from(template_url, repo_dir, branch='main')
+    Repo.clone_from(template_url, repo_dir, branch='main', depth=1,
+                    single_branch=True)
 
 
 def update_template(repo_dir, project_name):
@@ -94,16 +122,43 @@ def update_template(repo_dir, project_name):
 
     # replace all occurences of template strings in repo
     zipd = [(template_src_dir, src_dir), (template_name, project_name)]
-    for to_replace, replace_with in zipd:
-        term = subprocess.Popen(
-            ["find", repo_dir, "-type", "f"],
-            stdout=subprocess.PIPE
-            )
-        find_out = term.communicate()[0]
-        term2 = subprocess.Popen(
-            ["xargs", "sed", "-i", f"s/{to_replace}/{replace_with}/g"],
-            stdin=subprocess.PIPE)
-        term2.communicate(find_out)  # noqa: F841
+    subs = [(old.encode(), new.encode()) for old, new in zipd]
+    for root, dirs, files in os.walk(repo_dir):
+        dirs[:] = [d for d in dirs if d != '.git']
+        for file_name in files:
+            pth = join(root, file_name)
+            if os.path.islink(pth):  # never rewrite files outside the repo
+                continue
+            _replace_in_file(pth, subs)
+
+
+def _replace_in_file(pth, subs):
+    """Apply byte substitutions to file, rewriting only if changed.
+
+    Unreadable files (e.g. broken symlinks) and files containing null bytes
+    (treated as binary) are skipped. Large files are first scanned through
+    a read-only mmap and only read in if some substitution matches.
+    """
+    try:
+        with open(pth, 'rb') as fh:
+            if os.fstat(fh.fileno()).st_size < MMAP_THRESHOLD:
+                data = fh.read()
+            else:
+                with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if all(mm.find(old) == -1 for old, _ in subs):
+                        return
+                    data = mm[:]
+    except OSError:
+        return
+    if b'\x00' in data:
+        return
+
+    new_data = data
+    for to_replace, replace_with in subs:
+        new_data = new_data.replace(to_replace, replace_with)
+    if new_data != data:
+        with open(pth, 'wb') as fh:
+            fh.write(new_data)
 
 
 def init_repo(repo_dir, args):
@@ -119,7 +174,7 @@ def init_repo(repo_dir, args):
         args.github_user (str): github username (if args.sync is True)
         args.github_api_token (str): github api token (if args.sync is True)
     """
-    repo = Repo.init(repo_dir)
+    repo = Repo.init(repo_dir, initial_branch='main')
     repo.git.add(all=True)
     repo.git.commit('-m', 'init project template')
 
@@ -144,7 +199,7 @@ def init_github_repo(project_name, github_user, github_api_token):
         req (request object): result of github API call
 
     Raises:
-        Exception: Description
+        requests.HTTPError: if github responds with an error status
     """
     request_url = 'https://api.github.com/user/repos'
     payload = {
@@ -155,15 +210,12 @@ def init_github_repo(project_name, github_user, github_api_token):
         "has_wiki": True
         }
     
-    req = requests.post(
+    req = SESSION.post(
         request_url,
         auth=(github_user, github_api_token),
-        data=json.dumps(payload))
-
-    if req.status_code != 201:
-        print(req)
-        raise Exception('Something went wrong')
+        json=payload)
 
+    req.raise_for_status()
     return req
 
 
@@ -174,16 +226,9 @@ def init_venv(proj_dir, proj_name):
         proj_dir (str, path): Path to save project
         proj_name (str): Project name (use hyphens as sep!)
     """
-    current = os.getcwd()
-    os.chdir(join(proj_dir, proj_name))
-
-    # create venv and upgrade pip
-    subprocess.call(['python', '-m', 'venv', '.venv'])
-    subprocess.call([
-        join(proj_dir, proj_name, '.venv', 'bin', 'pip'),
-        'install', '--upgrade', 'pip'])
-
-    os.chdir(current)
+    # create venv and upgrade pip (in the same venv bootstrap process)
+    subprocess.check_call(['python', '-m', 'venv', '--upgrade-deps', '.venv'],
+                          cwd=join(proj_dir, proj_name))
 
 
 # # Main Entry
@@ -13,12 +13,35 @@ by Samuel Thorpe
 # # Imports
 # -----------------------------------------------------|
 import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import boto3
+from botocore.config import Config
+from boto3.s3.transfer import TransferConfig, create_transfer_manager
 from logging import getLogger
+from sampy import SampyException
 from sampy.utils.logger import log_exceptions
+try:
+    import aioboto3
+except ImportError:  # pragma: no cover
+    aioboto3 = None
 logger = getLogger(__name__)
 
 
+# # Globals
+# -----------------------------------------------------|
+MAX_WORKERS = 16  # concurrent transfers, each is a blocking https call
+TRANSFER_CONCURRENCY = 10  # threads (parts) per transfer
+MAX_POOL_CONNECTIONS = MAX_WORKERS * TRANSFER_CONCURRENCY
+MAX_ASYNC_UPLOADS = 32  # in-flight uploads for push_folder_to_s3_async
+MULTIPART_THRESHOLD = 8 * 1024 * 1024  # bytes, split larger files into parts
+
+
+# # General Exception Class
+# -----------------------------------------------------|
+AwsS3Exception = type('AwsS3Exception', (SampyException,), {})
+
+
 # # Primary Class
 # -----------------------------------------------------|
 class AwsS3:
@@ -31,8 +54,15 @@ class AwsS3:
             session_params (dct, optional): Dict of optional session params
         """
         self._params = {} if session_params is None else session_params
+        # size connection pools for MAX_WORKERS concurrent transfers of
+        # TRANSFER_CONCURRENCY threads each (botocore's default is 10)
+        pool_config = Config(max_pool_connections=MAX_POOL_CONNECTIONS)
         self._session = boto3.Session(**self._params)
-        self._resource = boto3.resource('s3')
+        self._resource = boto3.resource('s3', config=pool_config)
+        self._client = self._session.client('s3', config=pool_config)
+        self._transfer_config = TransferConfig(
+            multipart_threshold=MULTIPART_THRESHOLD,
+            max_concurrency=TRANSFER_CONCURRENCY, use_threads=True)
 
     @log_exceptions()
     def get_file_in_path(self, s3_path, local_dir):
@@ -68,18 +98,24 @@ class AwsS3:
         """
         logger.info(f"Pulling all files in {s3_dir} to {local_dir}")
 
-        bucket, key = s3_dir[5:].split('/', 1)
-        bucket = self._resource.Bucket(bucket)
-        outputs = []
+        bucket_name, key = s3_dir[5:].split('/', 1)
+        bucket = self._resource.Bucket(bucket_name)
+        outputs, tasks = [], []
         for obj in bucket.objects.filter(Prefix=key):
             file_name = obj.key.split('/')[-1]
             local_path = f"{local_dir}/{file_name}"
             if not obj.key.endswith('/'):
-                bucket.download_file(obj.key, local_path)
+                tasks.append((bucket_name, obj.key, local_path))
                 outputs.append({
                     "local_path": local_path,
                     "file_name": file_name})
 
+        # download concurrently (clients are thread safe, resources are not)
+        client = self._resource.meta.client
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            list(pool.map(lambda task: client.download_file(
+                *task, Config=self._transfer_config), tasks))
+
         return outputs
 
     @log_exceptions()
@@ -90,34 +126,42 @@ class AwsS3:
             local_dir (str): local directory to push
             bucket (str): bucket to push to
             s3_dir (str): prefix to push to
-            **kwrgs: Description
+            **kwrgs: ignore_ext (list, optional) file extensions to skip
+                (the legacy misspelled 'ingore_ext' is also accepted)
         """
         logger.info(f"Pushing all files in {local_dir} to "
                     f"S3 location: {bucket}/{s3_dir}")
 
-        for file in os.listdir(local_dir):
-            if self._check_ignore(file, **kwrgs):
-                logger.info(f"ignoring {file}")
-                continue
-
-            self.push_file_to_s3(f"{local_dir}/{file}", bucket, s3_dir)
-
-    @log_exceptions()
-    def _check_ignore(file, **kwrgs):
+        ignore_ext = frozenset(
+            kwrgs.get('ignore_ext') or kwrgs.get('ingore_ext') or ())
+        paths = []
+        with os.scandir(local_dir) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                if self._check_ignore(entry.name, ignore_ext):
+                    logger.info(f"ignoring {entry.name}")
+                    continue
+                paths.append(entry.path)
+
+        # upload concurrently over the shared client
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            list(pool.map(
+                lambda pth: self.push_file_to_s3(pth, bucket, s3_dir), paths))
+
+    @staticmethod
+    def _check_ignore(file, ignore_ext=frozenset()):
         """Return True if file should be ignored."""
-        dss_chk = file == '.DS_Store'
-        ext_chk = os.path.splitext(file)[-1] in kwrgs.get('ingore_ext', [])
-
-        return any([dss_chk, ext_chk])
+        return file == '.DS_Store' or os.path.splitext(file)[-1] in ignore_ext
 
     @log_exceptions()
     def push_file_to_s3(self, local_file, bucket, s3_dir):
         """Push specified local file to s3."""
         logger.info(f"Pushing {local_file} to S3 location: {bucket}/{s3_dir}")
 
-        client = self._session.client('s3')
         local_dir, file = os.path.split(local_file)
-        client.upload_file(local_file, bucket, f"{s3_dir}/{file}")
+        self._client.upload_file(local_file, bucket, f"{s3_dir}/{file}",
+                                 Config=self._transfer_config)
 
     @log_exceptions()
     def push_folder_to_s3(self, local_dir, bucket_name, prefix=""):
@@ -128,22 +172,101 @@ class AwsS3:
         local_dir (str): Path to the local folder to upload.
         bucket_name (str): Name of the S3 bucket.
         prefix (str): Optional folder path in S3 to upload the contents into.
+
+        Raises:
+        AwsS3Exception: if any uploads failed (after attempting all files).
+        """
+        # one manager shares its threads across all files, well within the
+        # session client's MAX_POOL_CONNECTIONS
+        config = TransferConfig(
+            multipart_threshold=MULTIPART_THRESHOLD,
+            max_concurrency=2 * TRANSFER_CONCURRENCY, use_threads=True)
+
+        with create_transfer_manager(self._client, config) as manager:
+
+            # Walk through the local folder, submitting uploads as we go
+            futures = []
+            for local_pth, s3_key in _iter_upload_keys(local_dir, prefix):
+                futures.append((local_pth, s3_key, manager.upload(
+                    local_pth, bucket_name, s3_key)))
+
+            # Wait on the uploads
+            failed = []
+            for local_pth, s3_key, future in futures:
+                try:
+                    future.result()
+                    logger.info(
+                        f"Uploaded {local_pth} to s3://{bucket_name}/{s3_key}")
+                except Exception:
+                    logger.exception(f"Failed to upload {local_pth}")
+                    failed.append(local_pth)
+
+        if failed:
+            raise AwsS3Exception(
+                f"Failed to upload {len(failed)} file(s): {failed}")
+
+    async def push_folder_to_s3_async(self, local_dir, bucket_name, prefix=""):
         """
-        s3_client = boto3.client("s3")
+        Async version of push_folder_to_s3, requires aioboto3.
 
-        # Walk through the local folder
-        for root, _, files in os.walk(local_dir):
-            for file_name in files:
-                local_pth = os.path.join(root, file_name)
+        Uploads overlap on a single event loop (at most MAX_ASYNC_UPLOADS in
+        flight) rather than on a thread pool. Run from sync code with e.g.
+        asyncio.run(s3.push_folder_to_s3_async(...)).
 
-                # Create the relative path for the S3 object key
-                rel_pth = os.path.relpath(local_pth, local_dir)
-                s3_key = os.path.join(prefix, rel_pth).replace("\\", "/")
-                s3_url = f"s3://{bucket_name}/{s3_key}"
+        Parameters:
+        local_dir (str): Path to the local folder to upload.
+        bucket_name (str): Name of the S3 bucket.
+        prefix (str): Optional folder path in S3 to upload the contents into.
 
-                # Upload the file to S3
-                try:
-                    s3_client.upload_file(local_pth, bucket_name, s3_key)
-                    logger.info(f"Uploaded {local_pth} to {s3_url}")
-                except Exception as e:
-                    print(f"Failed to upload {local_pth}: {e}")
\ No newline at end of file
+        Raises:
+        AwsS3Exception: if aioboto3 is missing, or any uploads failed.
+        """
+        if aioboto3 is None:
+            raise AwsS3Exception('aioboto3 is required for async uploads')
+
+        tasks = list(_iter_upload_keys(local_dir, prefix))
+        semaphore = asyncio.Semaphore(MAX_ASYNC_UPLOADS)
+        session = aioboto3.Session(**self._params)
+        async with session.client('s3') as s3_client:
+
+            async def _upload(local_pth, s3_key):
+                async with semaphore:
+                    await s3_client.upload_file(local_pth, bucket_name, s3_key)
+
+            results = await asyncio.gather(
+                *[_upload(*task) for task in tasks], return_exceptions=True)
+
+        failed = []
+        for (local_pth, s3_key), result in zip(tasks, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to upload {local_pth}", exc_info=result)
+                failed.append(local_pth)
+            else:
+                logger.info(
+                    f"Uploaded {local_pth} to s3://{bucket_name}/{s3_key}")
+
+        if failed:
+            raise AwsS3Exception(
+                f"Failed to upload {len(failed)} file(s): {failed}")
+
+
+# # Helpers
+# -----------------------------------------------------|
+def _iter_upload_keys(local_dir, prefix=""):
+    """Yield (local path, S3 key) for files under local_dir."""
+    key_prefix = (prefix.rstrip('/'),) if prefix.rstrip('/') else ()
+    for entry, rel_parts in _iter_files(local_dir):
+        yield entry.path, "/".join(key_prefix + rel_parts + (entry.name,))
+
+
+def _iter_files(local_dir, rel_parts=()):
+    """Recursively yield (DirEntry, relative dir parts) for files in local_dir.
+
+    Like os.walk (default followlinks=False), symlinked dirs are not entered.
+    """
+    with os.scandir(local_dir) as entries:
+        for entry in entries:
+            if not entry.is_dir():
+                yield entry, rel_parts
+            elif not entry.is_symlink():
+                yield from _iter_files(entry.path, rel_parts + (entry.name,))
@@ -18,14 +18,23 @@ import platform
 import sysconfig
 from os.path import basename
 import logging
-import git
-import pkg_resources
-import pytz
-from datetime import datetime
+from datetime import datetime, timezone
 import time
 import functools
 import json
-import pandas as pd
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+# # Globals
+# -----------------------------------------------------|
+TIMESTAMP_FMT = "%Y-%m-%dT%H:%M:%S"
+JSON_SEPARATORS = (',', ':')  # compact, as orjson writes
+JSON_RECORD_FMT = \
+    '{{"timestamp":"{timestamp}","level":{level},"message":{message},' \
+    '"module":{module},"funcName":{funcName},"lineNo":{lineNo}}}'
 
 
 # # Primary init log method
@@ -52,7 +61,7 @@ def init_log(base_dir, console_level="INFO", file_level="INFO", **kwrgs):
 
     # setup file handler
     os.makedirs(log_dir, exist_ok=True)
-    dt_utc = datetime.now(pytz.utc).strftime("%Y%m%d-%H%M%S")
+    dt_utc = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
     log_file_name = os.path.join(log_dir, f'run-{dt_utc}.log')
     fh = _get_file_handler(log_file_name, file_level)
     handlers.append(fh)
@@ -70,12 +79,18 @@ def init_log(base_dir, console_level="INFO", file_level="INFO", **kwrgs):
 def _setup_record_factory(base_dir):
     """Return custom record factory for formatting logger."""
     old_factory = logging.getLogRecordFactory()
+    base = os.path.abspath(base_dir).rstrip(os.sep) + os.sep
+    table = str.maketrans({os.sep: '.'})
 
     def record_factory(*args, **kwargs):
         """Set up new record factory."""
         record = old_factory(*args, **kwargs)
-        mod_path = record.pathname.split(base_dir)[-1]
-        record.module_path = mod_path.replace(os.sep, '.')[1:]
+        pth = record.pathname
+        if not os.path.isabs(pth):  # o.w. already absolute like base
+            pth = os.path.abspath(pth)
+        mod_path = pth[len(base):] if pth.startswith(base) else \
+            pth.lstrip(os.sep)
+        record.module_path = mod_path.translate(table)
         return record
 
     logging.setLogRecordFactory(record_factory)
@@ -94,7 +109,7 @@ def _get_console_handler(console_level="INFO"):
 
 def _get_file_handler(log_filename, file_level="DEBUG"):
     """Create file handler at lower level."""
-    fh = logging.FileHandler(log_filename)
+    fh = logging.FileHandler(log_filename, encoding='utf-8')
     fh.setLevel(file_level)
     # fh_formatter = logging.Formatter(
     #     '%(asctime)s : %(levelname)s : %(name)s : %(message)s')
@@ -114,8 +129,14 @@ def _log_header(logger, base_dir, dt_utc):
     _log_repo(logger, base_dir)
 
     # log dependencies
-    pkg = [(d.project_name, d.version) for d in pkg_resources.working_set]
-    logger.info(f"Installed package versions are: {pkg}")
+    logger.info(f"Installed package versions are: {_installed_packages()}")
+
+
+@functools.lru_cache(maxsize=None)
+def _installed_packages():
+    """Return (cached) list of installed (name, version) tuples."""
+    from importlib.metadata import distributions
+    return [(d.metadata['Name'], d.version) for d in distributions()]
 
 
 def _log_platform(logger):
@@ -155,10 +176,11 @@ def git_info(repo_dir):
         dct: git details including current branch, commit hash, commit summary
              and commit author
     """
+    import git  # NOTE: imported lazily, gitpython is slow to import
     try:
         repo = git.Repo(repo_dir)
         commit = repo.head.commit
-        author = repo.git.show("-s", "--format=%an <%ae>", commit.hexsha)
+        author = f"{commit.author.name} <{commit.author.email}>"
         return {'repo': basename(repo_dir),
                 'branch': str(repo.active_branch),
                 'commit': commit.hexsha,
@@ -193,24 +215,66 @@ class JsonFormatter(logging.Formatter):
     """Custom formatter to output logs as JSON."""
 
     def format(self, record):
+        timestamp = time.strftime(TIMESTAMP_FMT, time.gmtime(record.created))
+        timestamp = f"{timestamp}.{int(record.msecs):03d}"
+
+        # fast path, fill a prebuilt template encoding only the str fields
+        # (output is identical to _dumps of the full record dict below)
+        if not record.exc_info:
+            try:
+                return JSON_RECORD_FMT.format(
+                    timestamp=timestamp,
+                    level=_encode(record.levelname),
+                    message=_encode(record.getMessage()),
+                    module=_encode(record.module_path),
+                    funcName=_encode(record.funcName),
+                    lineNo=int(record.lineno))
+            except TypeError:
+                pass  # e.g. lone surrogates, let _dumps fall back below
+
         log_message = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": timestamp,
             "level": record.levelname,
             "message": record.getMessage(),
             "module": record.module_path,
             "funcName": record.funcName,
-            "lineNo": record.lineno
+            "lineNo": record.lineno,
         }
-        # Include exception details if any
+
+        # Include exception details
         if record.exc_info:
             log_message["exception"] = self.formatException(record.exc_info)
-        return json.dumps(log_message)
+        return _dumps(log_message)
+
+
+def _encode(obj):
+    """Serialize obj to compact json str, using orjson if available."""
+    if orjson is None:
+        return json.dumps(obj, separators=JSON_SEPARATORS)
+    return orjson.dumps(obj).decode()
+
+
+def _dumps(obj):
+    """Serialize obj to compact json str, using orjson if available.
+
+    NOTE: orjson raises TypeError where json copes (e.g. lone surrogates
+          in the message, ints beyond 64 bits), so fall back to json there.
+    """
+    try:
+        return _encode(obj)
+    except TypeError:
+        return json.dumps(obj, separators=JSON_SEPARATORS)
 
 
 # # Json Log Reader
 # -----------------------------------------------------|
 def read_log(log_file):
-    """Read json formatted log file in dataframe."""
-    with open(log_file, 'r') as fh:
-        log_str = f'[{",".join(fh.readlines())}]'
-        return pd.DataFrame(json.loads(log_str))
+    """Read json formatted log file in dataframe.
+
+    NOTE: the file handler writes one json record per line, so this can use
+          the line-delimited reader directly (timestamps are left as str, and
+          dtypes are not inferred so e.g. numeric-looking messages stay str)
+    """
+    import pandas as pd  # NOTE: imported lazily, only needed here
+    return pd.read_json(log_file, lines=True, convert_dates=False,
+                        dtype=False)
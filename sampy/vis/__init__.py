@@ -12,16 +12,32 @@ by Samuel Thorpe
 
 # # Imports
 # -----------------------------------------------------|
+import functools
 import numpy as np
-from matplotlib.colors import ListedColormap
 
 
 # # Globals
 # -----------------------------------------------------|
-HOTNCOLD_ARRAY = np.zeros([256, 3])
-HOTNCOLD_ARRAY[:128, 2] = np.linspace(0, 1, 128)[::-1]
-HOTNCOLD_ARRAY[128:, 0] = np.linspace(0, 1, 128)
-HOTNCOLD = ListedColormap(HOTNCOLD_ARRAY)
+# NOTE: HOTNCOLD_ARRAY and HOTNCOLD are built lazily on first access (see
+#       module __getattr__ below), so importing sampy.vis stays cheap
+def __getattr__(name):
+    """Return lazily built module globals."""
+    if name == 'HOTNCOLD_ARRAY':
+        return _hotncold()[0]
+    if name == 'HOTNCOLD':
+        return _hotncold()[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@functools.lru_cache(maxsize=None)
+def _hotncold():
+    """Build the hot-n-cold colormap array and ListedColormap."""
+    from matplotlib.colors import ListedColormap
+    ramp = np.linspace(0, 1, 128, dtype=np.float32)
+    hotncold_array = np.zeros((256, 3), dtype=np.float32)
+    hotncold_array[:128, 2] = ramp[::-1]
+    hotncold_array[128:, 0] = ramp
+    return hotncold_array, ListedColormap(hotncold_array)
 
 
 # # Vis Exception Class
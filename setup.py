@@ -70,7 +70,8 @@ setuptools.setup(
     name=repo_name,
     version=os.environ.get("VERSION"),
     install_requires=get_requirements(requirements_path),
-    extras_require={"test": get_requirements(test_requirements_path)},
+    extras_require={"test": get_requirements(test_requirements_path),
+                    "numba": ["numba"]},
     author="Samuel Thorpe",
     description=f"Repository housing {repo_name} tools",
     long_description=long_description,
@@ -0,0 +1,108 @@
+"""
+Module housing sampy.common unit test classes.
+
+# NOTES
+# ----------------------------------------------------------------------------|
+
+
+written March 2024
+by Samuel Thorpe
+"""
+
+
+# # Imports
+# -----------------------------------------------------|
+import unittest
+import numpy as np
+from sampy import common
+
+
+# # Main Class
+# -----------------------------------------------------|
+class TestRefineSeries(unittest.TestCase):
+    """Check refine_series hunt search against np.searchsorted."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up class for unit tests."""
+        rng = np.random.default_rng(0)
+        coarse = np.sort(rng.uniform(0, 100, 50))
+        cls.cases = {
+            'sorted': (coarse, np.linspace(-5, 105, 400)),
+            'unsorted': (coarse, rng.uniform(-5, 105, 400)),
+            'duplicates': (np.repeat(coarse[::5], 3),
+                           np.repeat(coarse[::2], 2)),
+            'empty_refined': (coarse, np.empty(0)),
+            'empty_coarse': (np.empty(0), np.linspace(0, 1, 5)),
+        }
+
+    @staticmethod
+    def _expected(coarse, refined):
+        """Return np.searchsorted reference indices."""
+        ridx = np.searchsorted(coarse, refined, side='right') - 1
+        return np.clip(ridx, 0, None).astype(np.intp)
+
+    def test_hunt_parity(self):
+        """Test the (pure python) hunt search matches np.searchsorted."""
+        for name, (coarse, refined) in self.cases.items():
+            with self.subTest(name):
+                out = np.empty(refined.shape[0], dtype=np.intp)
+                np.testing.assert_array_equal(
+                    common._refine_hunted(coarse, refined, out),
+                    self._expected(coarse, refined))
+
+    def test_refine_series_parity(self):
+        """Test refine_series (jitted if numba available) parity."""
+        for name, (coarse, refined) in self.cases.items():
+            with self.subTest(name):
+                ridx = common.refine_series(coarse, refined)
+                self.assertEqual(ridx.dtype, np.intp)
+                np.testing.assert_array_equal(
+                    ridx, self._expected(coarse, refined))
+
+
+class TestStructReplace(unittest.TestCase):
+    """Check struct_replace on existing and new leaf fields."""
+
+    def test_struct_replace(self):
+        """Test nested replacement and appending a new leaf field."""
+        strct = common.struct({'a': 1, 'b': common.struct({'c': 2})})
+        self.assertEqual(common.struct_replace(strct, ['b', 'c'], 9).b.c, 9)
+        new = common.struct_replace(strct, 'new', 5)
+        self.assertEqual(new._fields, ('a', 'b', 'new'))
+        self.assertEqual(new.new, 5)
+        self.assertEqual(
+            common.struct_replace(strct, ['b', 'd'], 3).b._fields, ('c', 'd'))
+
+
+class TestCheckEquality(unittest.TestCase):
+    """Check scalars and arrays share the same tolerance rule."""
+
+    def test_tolerance_consistent(self):
+        """Test |x - y| == tol fails for scalars and arrays alike."""
+        eps = common.EPS_FLOAT32
+        for x_val, y_val in [(0.0, eps), ([0.0], [eps]),
+                             (np.zeros(3), np.full(3, eps))]:
+            with self.subTest(x=x_val, y=y_val):
+                with self.assertRaises(AssertionError):
+                    common.check_equality(x_val, y_val)
+        common.check_equality(0.0, eps / 2)
+        common.check_equality([0.0], [eps / 2])
+
+    def test_special_values(self):
+        """Test infs, NaNs, bools and unsigned ints in the array path."""
+        vals = [np.inf, -np.inf, np.nan, 1.0]
+        common.check_equality(vals, list(vals))
+        common.check_equality(np.array([True, False]), np.array([True, False]))
+        common.check_equality(np.array([3], np.uint8), np.array([3], np.uint8))
+        with self.assertRaises(AssertionError):
+            common.check_equality(np.array([3], np.uint8),
+                                  np.array([5], np.uint8))
+        with self.assertRaises(AssertionError):
+            common.check_equality([np.inf], [-np.inf])
+
+
+# # Main Entry
+# -----------------------------------------------------|
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+"""
+Module housing sampy.io unit test classes.
+
+# NOTES
+# ----------------------------------------------------------------------------|
+
+
+written March 2024
+by Samuel Thorpe
+"""
+
+
+# # Imports
+# -----------------------------------------------------|
+import unittest
+import tempfile
+import json
+import sys
+import subprocess
+import textwrap
+from os.path import join, exists, dirname
+from pathlib import Path
+import numpy as np
+from sampy.io import batch_saver, batch_loader
+
+
+# # Globals
+# -----------------------------------------------------|
+REPO_DIR = dirname(dirname(dirname(__file__)))
+
+
+# # Main Class
+# -----------------------------------------------------|
+class TestBatchIO(unittest.TestCase):
+    """Round trip batch_saver/batch_loader."""
+
+    def setUp(self):
+        """Set up a scratch dir per test."""
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp_dir = self._tmp.name
+
+    def tearDown(self):
+        """Remove the scratch dir."""
+        self._tmp.cleanup()
+
+    def test_npy_round_trip(self):
+        """Test .npy loads in memory by default, so it can be saved over."""
+        fout = join(self.tmp_dir, 'm.npy')
+        batch_saver(np.arange(100.), fout)
+        arr = batch_loader(fout)
+        self.assertNotIsInstance(arr, np.memmap)
+        batch_saver(arr[:10], fout)
+        np.testing.assert_array_equal(batch_loader(fout), np.arange(10.))
+
+    def test_npy_mmap(self):
+        """Test opt-in read-only memory-mapped .npy load."""
+        fout = join(self.tmp_dir, 'm.npy')
+        batch_saver(np.arange(100.), fout)
+        arr = batch_loader(fout, mmap_mode='r')
+        self.assertIsInstance(arr, np.memmap)
+        self.assertFalse(arr.flags.writeable)
+        np.testing.assert_array_equal(arr, np.arange(100.))
+        del arr
+
+    def test_json_int_boundaries(self):
+        """Test ints around the 64 bit limits load exactly."""
+        ints = [2**63 - 1, -2**63, -2**63 - 1, 2**63, 2**64 - 1, 2**64,
+                -2**64, 10**30]
+        fin = join(self.tmp_dir, 'ints.json')
+        for val in ints:
+            with self.subTest(val):
+                with open(fin, 'w') as jsn:
+                    json.dump({'id': val}, jsn)
+                loaded = batch_loader(fin)['id']
+                self.assertIsInstance(loaded, int)
+                self.assertEqual(loaded, val)
+
+    def test_json_non_finite(self):
+        """Test NaN/Infinity round trip as with the stdlib json module."""
+        fout = join(self.tmp_dir, 'nan.json')
+        batch_saver({'nan': float('nan'), 'inf': float('inf')}, fout)
+        loaded = batch_loader(fout)
+        self.assertTrue(np.isnan(loaded['nan']))
+        self.assertEqual(loaded['inf'], float('inf'))
+
+    def test_pkl_buffers(self):
+        """Test ndarray payloads round trip with a .bufs companion."""
+        fout = join(self.tmp_dir, 'x.pkl')
+        dat = {'arr': np.arange(1000.).reshape(10, 100), 'lst': [1, 'a']}
+        batch_saver(dat, fout)
+        self.assertTrue(exists(fout + '.bufs'))
+        loaded = batch_loader(fout)
+        np.testing.assert_array_equal(loaded['arr'], dat['arr'])
+        self.assertTrue(loaded['arr'].flags.writeable)
+        self.assertEqual(loaded['lst'], dat['lst'])
+
+    def test_pkl_dill_overwrite(self):
+        """Test a dill-only save over a buffered file removes its .bufs."""
+        fout = join(self.tmp_dir, 'x.pkl')
+        batch_saver({'arr': np.ones(100)}, fout)
+        self.assertTrue(exists(fout + '.bufs'))
+        batch_saver({'fun': lambda val: val + 1}, fout)
+        self.assertFalse(exists(fout + '.bufs'))
+        self.assertEqual(batch_loader(fout)['fun'](1), 2)
+
+    def test_pkl_main_class(self):
+        """Test __main__ classes are stored by value, loadable elsewhere."""
+        fout = join(self.tmp_dir, 'main.pkl')
+        script = textwrap.dedent(f"""
+            import numpy as np
+            from sampy.io import batch_saver
+
+            class Foo:
+                def __init__(self):
+                    self.arr = np.arange(5.)
+
+            batch_saver(Foo(), {fout!r})
+            """)
+        subprocess.run([sys.executable, '-c', script], cwd=REPO_DIR,
+                       check=True)
+        loaded = batch_loader(fout)
+        self.assertEqual(type(loaded).__name__, 'Foo')
+        np.testing.assert_array_equal(loaded.arr, np.arange(5.))
+
+    def test_pkl_path_input(self):
+        """Test pathlib.Path inputs, with and without buffers."""
+        for dat in ({'arr': np.arange(10.)}, {'lst': [1, 2]}):
+            with self.subTest(list(dat)):
+                fout = Path(self.tmp_dir) / 'p.pkl'
+                batch_saver(dat, fout)
+                loaded = batch_loader(fout)
+                self.assertEqual(list(loaded), list(dat))
+                np.testing.assert_array_equal(
+                    list(loaded.values())[0], list(dat.values())[0])
+
+
+# # Main Entry
+# -----------------------------------------------------|
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+"""
+Module housing sampy.utils.logger unit test classes.
+
+# NOTES
+# ----------------------------------------------------------------------------|
+
+
+written March 2024
+by Samuel Thorpe
+"""
+
+
+# # Imports
+# -----------------------------------------------------|
+import unittest
+from unittest import mock
+import os
+import json
+import logging
+import time
+from sampy.utils import logger as sampy_logger
+
+
+# # Main Class
+# -----------------------------------------------------|
+class TestJsonFormatter(unittest.TestCase):
+    """Check the JsonFormatter template fast path."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up class for unit tests."""
+        cls.messages = ['plain', 'quotes " and \\ slash', 'new\nline\ttab',
+                        'unicode é 漢字', 'lone \udc80 surrogate', '']
+
+    @staticmethod
+    def _record(msg, **kwargs):
+        """Return a log record as built by the sampy record factory."""
+        attrs = {'msg': msg, 'levelname': 'INFO', 'funcName': 'func',
+                 'lineno': 12, 'module_path': 'pkg.mod.py',
+                 'created': 1700000000.25, 'msecs': 250.0}
+        attrs.update(kwargs)
+        return logging.makeLogRecord(attrs)
+
+    @staticmethod
+    def _as_dict(record):
+        """Return the record dict the slow path serializes."""
+        timestamp = time.strftime(sampy_logger.TIMESTAMP_FMT,
+                                  time.gmtime(record.created))
+        return {"timestamp": f"{timestamp}.{int(record.msecs):03d}",
+                "level": record.levelname,
+                "message": record.getMessage(),
+                "module": record.module_path,
+                "funcName": record.funcName,
+                "lineNo": record.lineno}
+
+    def _check_identical(self):
+        """Test fast path output is byte-identical to _dumps(dict)."""
+        formatter = sampy_logger.JsonFormatter()
+        for msg in self.messages:
+            for record in (self._record(msg), self._record(msg, funcName=None),
+                           self._record(msg, levelname='WEIRD "LVL"')):
+                with self.subTest(msg=msg, func=record.funcName):
+                    expected = sampy_logger._dumps(self._as_dict(record))
+                    self.assertEqual(formatter.format(record), expected)
+                    json.loads(expected)
+
+    def test_fast_path_identical(self):
+        """Test fast path matches _dumps with the installed backend."""
+        self._check_identical()
+
+    def test_fast_path_used(self):
+        """Test plain records skip the dict serialization."""
+        formatter = sampy_logger.JsonFormatter()
+        with mock.patch.object(sampy_logger, '_dumps',
+                               side_effect=AssertionError):
+            json.loads(formatter.format(self._record('plain')))
+
+    def test_fast_path_identical_stdlib(self):
+        """Test fast path matches _dumps with the stdlib json backend."""
+        with mock.patch.object(sampy_logger, 'orjson', None):
+            self._check_identical()
+
+
+class TestRecordFactory(unittest.TestCase):
+    """Check module_path for absolute and relative base dirs."""
+
+    def setUp(self):
+        """Keep the current record factory to restore after each test."""
+        self._factory = logging.getLogRecordFactory()
+
+    def tearDown(self):
+        """Restore the record factory."""
+        logging.setLogRecordFactory(self._factory)
+
+    def _module_path(self, base_dir, pathname):
+        """Return module_path of a record made after setting up base_dir."""
+        sampy_logger._setup_record_factory(base_dir)
+        record = logging.getLogRecordFactory()(
+            'root', logging.INFO, pathname, 1, 'msg', (), None)
+        return record.module_path
+
+    def test_module_path(self):
+        """Test absolute, relative and trailing-sep base dirs."""
+        proj = os.path.abspath('proj')
+        pathname = os.path.join(proj, 'pkg', 'mod.py')
+        base_dirs = (proj, proj + os.sep, 'proj', os.path.join('.', 'proj'))
+        for base_dir in base_dirs:
+            with self.subTest(base_dir):
+                self.assertEqual(self._module_path(base_dir, pathname),
+                                 'pkg.mod.py')
+        self.assertEqual(
+            self._module_path('proj', os.path.join('proj', 'pkg', 'mod.py')),
+            'pkg.mod.py')
+
+
+# # Main Entry
+# -----------------------------------------------------|
+if __name__ == "__main__":
+    unittest.main()